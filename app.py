@@ -1,59 +1,157 @@
 # skin info retrieved from https://bymykel.github.io/CSGO-API/api/en/skins.json
 
+import asyncio
+import atexit
+import hishel
 import httpx
-import json
+import ijson
 import time
+import urllib.parse
 import logging
 import random
+import re
+import orjson
+import os
+import queue
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional
 
-# Configure logging
+# Configure logging: records are formatted and queued by the calling thread, and a
+# background listener thread writes them to the log file and console
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(
+    log_queue,
+    logging.FileHandler('market_data.log'),
+    logging.StreamHandler()
+)
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.WARNING,  # Only warnings from third-party libraries (httpx, hishel, ...)
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('market_data.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(log_queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Persistent hashname -> nameid lookup table, so listing pages are only scraped once per item
+NAMEID_CACHE_FILE = 'nameid_cache.json'
+
+# Hashname suffixes indexed by wear value (0-4), and the StatTrak prefix
+_FLOAT_CONDITIONS = (" (Factory New)", " (Minimal Wear)", " (Field-Tested)", " (Well-Worn)", " (Battle-Scarred)")
+_STATTRAK_PREFIX = "StatTrak™ "
+
+# Matches the item nameid passed to Market_LoadOrderSpread on listing pages
+_NAMEID_RE = re.compile(r'Market_LoadOrderSpread\(\s*(\d+)')
+
+# How many processed skins are written to the JSON-Lines output between flushes
+JSONL_FLUSH_EVERY = 50
+
+# How many processed skins between progress log lines
+PROGRESS_LOG_EVERY = 50
 
 class RateLimitedClient:
-    """Client with rate limiting to prevent 429 errors"""
-    def __init__(self, min_delay=1.5, max_delay=3.0):
-        self.min_delay = min_delay
-        self.max_delay = max_delay
-        self.last_request_time = 0
-        self.client = httpx.Client()
-    
-    def wait_if_needed(self):
-        """Wait the appropriate amount of time since the last request"""
-        if self.last_request_time > 0:
-            elapsed = time.time() - self.last_request_time
-            delay = random.uniform(self.min_delay, self.max_delay)
-            if elapsed < delay:
-                wait_time = delay - elapsed
-                logger.debug(f"Rate limit: waiting {wait_time:.2f} seconds")
-                time.sleep(wait_time)
-    
-    def get(self, url: str) -> httpx.Response:
-        """Make a GET request with rate limiting"""
-        self.wait_if_needed()
-        try:
-            response = self.client.get(url)
-            self.last_request_time = time.time()
-            return response
-        except httpx.HTTPError as e:
-            if e.response and e.response.status_code == 429:
-                logger.warning("Rate limit hit, waiting longer...")
-                time.sleep(5)  # Wait longer if we hit the rate limit
-                return self.get(url)  # Retry the request
-            raise
-    
-    def close(self):
+    """
+    Async client with token-bucket rate limiting to prevent 429 errors
+    
+    Meant to be shared by all requests of a run and used as a context manager,
+    so one pool of keep-alive connections is reused and closed at the end:
+    
+        async with RateLimitedClient() as client:
+            await process_all_skins(client)
+    """
+    def __init__(self, rate=0.5, max_tokens=5, max_connections=100, max_keepalive_connections=20,
+                 cache_dir='.http_cache', cache_ttl=24 * 60 * 60, max_retries=5):
+        """
+        Args:
+            rate: Tokens added to the bucket per second (sustained requests/second)
+            max_tokens: Bucket capacity, i.e. the largest burst of requests allowed
+            max_connections: Maximum number of open connections in the pool
+            max_keepalive_connections: Maximum number of idle connections kept alive for reuse
+            cache_dir: Directory where cached responses are stored
+            cache_ttl: Seconds a cached response is kept on disk
+            max_retries: Maximum number of attempts for a request answered with 429 (at least 1)
+        """
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+        self.rate = rate
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated_at = time.monotonic()
+        self.max_retries = max_retries
+        # Keep connections to steamcommunity.com alive so TLS handshakes are reused,
+        # and cache responses on disk so reruns can revalidate them with ETags
+        self.client = hishel.AsyncCacheClient(
+            storage=hishel.AsyncFileStorage(base_path=Path(cache_dir), ttl=cache_ttl),
+            controller=hishel.Controller(),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            http2=True,
+            timeout=30.0
+        )
+    
+    def add_new_tokens(self):
+        """Refill the bucket based on the time elapsed since the last refill"""
+        now = time.monotonic()
+        new_tokens = (now - self.updated_at) * self.rate
+        self.tokens = min(self.tokens + new_tokens, self.max_tokens)
+        self.updated_at = now
+    
+    async def wait_for_token(self):
+        """Wait until a token is available, then consume it"""
+        self.add_new_tokens()
+        if self.tokens < 1:
+            logger.debug("Rate limit: waiting for token (%.2f available)", self.tokens)
+        while self.tokens < 1:
+            await asyncio.sleep(0.1)
+            self.add_new_tokens()
+        self.tokens -= 1
+    
+    async def get(self, url: str) -> httpx.Response:
+        """
+        Make a GET request with rate limiting
+        
+        Args:
+            url: URL to fetch
+        
+        Returns:
+            Response, possibly served from the cache
+        
+        Raises:
+            httpx.HTTPStatusError: If the request is still rate limited after max_retries attempts
+        """
+        for attempt in range(self.max_retries):
+            await self.wait_for_token()
+            response = await self.client.get(url)
+            if response.status_code != 429 or attempt == self.max_retries - 1:
+                break
+            # Back off exponentially unless the server tells us how long to wait, plus jitter
+            try:
+                delay = float(response.headers.get('Retry-After', 2 ** attempt))
+            except ValueError:
+                delay = 2 ** attempt
+            delay = min(delay, 60) + random.uniform(0, 1)
+            logger.warning("Rate limit hit, retrying in %.2f seconds (attempt %d/%d)", delay, attempt + 1, self.max_retries)
+            await asyncio.sleep(delay)
+        if response.status_code == 429:
+            response.raise_for_status()
+        return response
+    
+    async def close(self):
         """Close the underlying client"""
-        self.client.close()
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
 
 def get_hashname(item: str, skin: str, wear: int, stat: int = 0) -> str:
     """
@@ -68,108 +166,151 @@ def get_hashname(item: str, skin: str, wear: int, stat: int = 0) -> str:
     Returns:
         Steam market hashname
     """
-    item = item.replace(" ", "%20")
-    skin = skin.replace(" ", "%20")
-    float_conditions = {
-        0: "%20%28Factory%20New%29",
-        1: "%20%28Minimal%20Wear%29",
-        2: "%20%28Field-Tested%29",
-        3: "%20%28Well-Worn%29",
-        4: "%20%28Battle-Scarred%29"
-    }
-    wear = float_conditions[wear]
-    if stat == 1:
-        item = "StatTrak™%20" + item
-    return item + "%20%7C%20" + skin + wear
+    prefix = _STATTRAK_PREFIX if stat == 1 else ""
+    return urllib.parse.quote(f"{prefix}{item} | {skin}{_FLOAT_CONDITIONS[wear]}", safe="")
+
+def load_nameid_cache(filename: str = NAMEID_CACHE_FILE) -> dict:
+    """Load the hashname -> nameid lookup table, or an empty one if it doesn't exist yet or is corrupt"""
+    try:
+        with open(filename, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Ignoring corrupt nameid cache {filename}: {str(e)}")
+        return {}
 
-def get_nameid(hashname: str, client: RateLimitedClient) -> int:
-    """Get Steam market item nameid"""
-    logger.debug(f"Getting nameid for {hashname}")
-    response = client.get(f"https://steamcommunity.com/market/listings/730/{hashname}")
-    html = response.text
-    nameid = html.split('Market_LoadOrderSpread( ')[1]
-    nameid = nameid.split(' ')[0]
-    logger.debug(f"Got nameid: {nameid}")
-    return int(nameid)
+def save_nameid_cache(nameid_cache: dict, filename: str = NAMEID_CACHE_FILE):
+    """Atomically save the hashname -> nameid lookup table"""
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(orjson.dumps(nameid_cache, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_filename, filename)
+    logger.info(f"Saved {len(nameid_cache)} nameids to {filename}")
 
-def item_data(hashname: str, client: RateLimitedClient) -> dict:
+async def get_nameid(hashname: str, client: RateLimitedClient, nameid_cache: Optional[dict] = None) -> int:
     """
-    Get market data for an item
+    Get Steam market item nameid
     
     Args:
         hashname: Steam market hashname
         client: Rate-limited client to use for requests
+        nameid_cache: Optional hashname -> nameid lookup table, consulted first
+            and updated with newly scraped nameids
     
     Returns:
-        Dictionary containing market data
+        Steam market item nameid
     """
-    logger.info(f"Fetching market data for {hashname}")
-    start_time = time.time()
-    
-    nameid = str(get_nameid(hashname, client))
-    data = {}
+    if nameid_cache is not None and hashname in nameid_cache:
+        return nameid_cache[hashname]
+    logger.debug("Getting nameid for %s", hashname)
+    response = await client.get(f"https://steamcommunity.com/market/listings/730/{hashname}")
+    match = _NAMEID_RE.search(response.text)
+    if match is None:
+        raise ValueError(f"No nameid found on the listing page for {hashname}")
+    nameid = int(match.group(1))
+    logger.debug("Got nameid: %d", nameid)
+    if nameid_cache is not None:
+        nameid_cache[hashname] = nameid
+    return nameid
 
-    # Get order data
-    order_response = client.get(
-        f"https://steamcommunity.com/market/itemordershistogram?country=US&currency=1&language=english&two_factor=0&item_nameid={nameid}"
-    )
-    order_data = order_response.text
+async def get_volume(hashname: str, client: RateLimitedClient) -> Optional[bytes]:
+    """Get the raw priceoverview response body of an item, or None if the request failed"""
+    try:
+        volume_response = await client.get(
+            f"https://steamcommunity.com/market/priceoverview/?appid=730&currency=1&market_hash_name={hashname}"
+        )
+        return volume_response.content
+    except Exception as e:
+        logger.warning("Failed to get volume data: %s", e)
+        return None
+
+def parse_item_data(order_content: bytes, volume_content: Optional[bytes]) -> dict:
+    """
+    Parse raw itemordershistogram and priceoverview response bodies into market data
     
-    # Extract basic price data
-    data["buy_req"] = int((order_data.split('"highest_buy_order":"')[1]).split('"')[0])/100
-    data["sell_req"] = int((order_data.split('"lowest_sell_order":"')[1]).split('"')[0])/100
+    Runs in a worker process, so it must stay a picklable module-level function
+    and shouldn't log.
     
-    logger.debug(f"Prices - Buy: ${data['buy_req']}, Sell: ${data['sell_req']}")
+    Args:
+        order_content: itemordershistogram response body
+        volume_content: priceoverview response body, or None if it wasn't fetched
     
-    # Extract buy order graph
-    buy_graph_start = order_data.find('"buy_order_graph":') + len('"buy_order_graph":')
-    buy_graph_end = order_data.find(']],', buy_graph_start) + 2
-    buy_graph_str = order_data[buy_graph_start:buy_graph_end]
+    Returns:
+        Dictionary containing market data (volume is None if it isn't available)
+    """
+    order_json = orjson.loads(order_content)
+    data = {}
     
-    # Extract sell order graph
-    sell_graph_start = order_data.find('"sell_order_graph":') + len('"sell_order_graph":')
-    sell_graph_end = order_data.find(']],', sell_graph_start) + 2
-    sell_graph_str = order_data[sell_graph_start:sell_graph_end]
+    # Extract basic price data
+    data["buy_req"] = int(order_json["highest_buy_order"])/100
+    data["sell_req"] = int(order_json["lowest_sell_order"])/100
     
-    # Parse the graphs
-    try:
-        buy_graph = eval(buy_graph_str)  # Safe to use eval here as we know the format
-        sell_graph = eval(sell_graph_str)
-        
-        # Convert to list of dictionaries
-        data["buy_orders"] = [
-            {"price": float(order[0]), "count": order[1]} 
-            for order in buy_graph
-        ]
-        data["sell_orders"] = [
-            {"price": float(order[0]), "count": order[1]}
-            for order in sell_graph
-        ]
-        logger.debug(f"Parsed {len(data['buy_orders'])} buy orders and {len(data['sell_orders'])} sell orders")
-    except Exception as e:
-        logger.error(f"Failed to parse order graphs: {str(e)}")
-        data["buy_orders"] = []
-        data["sell_orders"] = []
+    # Convert order graphs to list of dictionaries
+    data["buy_orders"] = [
+        {"price": float(order[0]), "count": order[1]} 
+        for order in order_json["buy_order_graph"]
+    ]
+    data["sell_orders"] = [
+        {"price": float(order[0]), "count": order[1]}
+        for order in order_json["sell_order_graph"]
+    ]
     
-    # Get volume data
     try:
-        volume_response = client.get(
-            f"https://steamcommunity.com/market/priceoverview/?appid=730&currency=1&market_hash_name={hashname}"
-        )
-        data["volume"] = int((volume_response.text.split('volume":"')[1]).split('"')[0])
-        logger.debug(f"Volume: {data['volume']}")
-    except Exception as e:
-        logger.warning(f"Failed to get volume data: {str(e)}")
+        # Volumes above 999 are formatted with thousands separators, e.g. "1,234"
+        data["volume"] = int(orjson.loads(volume_content)["volume"].replace(',', ''))
+    except Exception:
         data["volume"] = None
-        
+    
+    return data
+
+async def item_data(hashname: str, client: RateLimitedClient, nameid_cache: Optional[dict] = None,
+                    pool: Optional[Executor] = None) -> dict:
+    """
+    Get market data for an item
+    
+    Args:
+        hashname: Steam market hashname
+        client: Rate-limited client to use for requests
+        nameid_cache: Optional hashname -> nameid lookup table (see get_nameid)
+        pool: Executor the responses are parsed in (the event loop's default
+            thread pool if not given)
+    
+    Returns:
+        Dictionary containing market data
+    """
+    logger.debug("Fetching market data for %s", hashname)
+    start_time = time.time()
+    
+    nameid = str(await get_nameid(hashname, client, nameid_cache))
+
+    # Get order and volume data concurrently, they only depend on the nameid/hashname
+    order_response, volume_content = await asyncio.gather(
+        client.get(
+            f"https://steamcommunity.com/market/itemordershistogram?country=US&currency=1&language=english&two_factor=0&item_nameid={nameid}"
+        ),
+        get_volume(hashname, client)
+    )
+    
+    # Parse off the event loop so it can keep other requests in flight
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(pool, parse_item_data, order_response.content, volume_content)
+    
+    logger.debug("Prices - Buy: $%s, Sell: $%s", data['buy_req'], data['sell_req'])
+    logger.debug("Parsed %d buy orders and %d sell orders", len(data['buy_orders']), len(data['sell_orders']))
+    if data["volume"] is None:
+        logger.warning("No volume data for %s", hashname)
+    else:
+        logger.debug("Volume: %d", data['volume'])
+    
     data["nameid"] = nameid
     
     elapsed_time = time.time() - start_time
-    logger.info(f"Completed fetching market data for {hashname} in {elapsed_time:.2f} seconds")
+    logger.debug("Completed fetching market data for %s in %.2f seconds", hashname, elapsed_time)
     
     return data
 
-def get_weapon_data(gun: str, skin: str, wear: int, stat: int = 0, client: RateLimitedClient = RateLimitedClient()) -> dict:
+async def get_weapon_data(gun: str, skin: str, wear: int, stat: int = 0, *, client: RateLimitedClient) -> dict:
     """
     Get market data for a weapon skin
     
@@ -185,11 +326,11 @@ def get_weapon_data(gun: str, skin: str, wear: int, stat: int = 0, client: RateL
     """
     hashname = get_hashname(gun, skin, wear, stat)
     try:
-        return item_data(hashname, client)
+        return await item_data(hashname, client)
     except Exception as e:
         return {"error": f"Item data not available: {str(e)}"}
 
-def get_case_data(case: str, client: RateLimitedClient) -> dict:
+async def get_case_data(case: str, client: RateLimitedClient) -> dict:
     """
     Get market data for a case
     
@@ -200,97 +341,180 @@ def get_case_data(case: str, client: RateLimitedClient) -> dict:
     Returns:
         Market data dictionary
     """
-    hashname = case.replace(' ', '%20')
+    hashname = urllib.parse.quote(case, safe="")
     try:
-        return item_data(hashname, client)
+        return await item_data(hashname, client)
     except Exception as e:
         return {"error": f"Item data not available: {str(e)}"}
 
 def save_item_data(data: dict, filename: str = "market_data.json"):
     """Save item data to a JSON file in a readable format"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     logger.info(f"Data saved to {filename}")
 
-def process_all_skins(input_file: str = 'skin_info_sanitized.json', output_file: str = 'complete_skin_info.json'):
+def jsonl_to_json(jsonl_file: str, output_file: str):
+    """
+    Convert a JSON-Lines file into an indented JSON array, one line at a time
+    
+    The array is written to a temporary file that atomically replaces output_file
+    once complete, so a failure never leaves a truncated output behind.
+    """
+    tmp_file = output_file + '.tmp'
+    try:
+        with open(jsonl_file, 'rb') as src, open(tmp_file, 'wb') as dst:
+            dst.write(b'[')
+            count = 0
+            for line in src:
+                dst.write(b',\n  ' if count else b'\n  ')
+                # Indent the item one level; JSON strings never contain raw newlines
+                item = orjson.dumps(orjson.loads(line), option=orjson.OPT_INDENT_2)
+                dst.write(item.replace(b'\n', b'\n  '))
+                count += 1
+            dst.write(b'\n]' if count else b']')
+        os.replace(tmp_file, output_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    logger.info(f"Converted {count} items from {jsonl_file} to {output_file}")
+
+async def process_all_skins(client: RateLimitedClient, input_file: str = 'skin_info_sanitized.json', output_file: str = 'complete_skin_info.json', max_concurrency: int = 5):
     """
     Process all skins from the sanitized JSON file, fetch market data for each,
     and save the complete information to a new file.
     
+    Skins are streamed from the input file one at a time and fetched concurrently,
+    with at most `max_concurrency` of them in flight at any time. Results are written
+    in input order; skins that finish ahead of a slower earlier one (e.g. one stuck in
+    429 backoff) are buffered until it completes, without holding up new fetches.
+    
     Args:
+        client: Rate-limited client to use for requests
         input_file: Path to the sanitized skin info JSON
         output_file: Path where the complete data will be saved
+        max_concurrency: Maximum number of skins fetched at the same time
     """
     start_time = time.time()
     logger.info(f"Starting skin processing - Input: {input_file}, Output: {output_file}")
     
     try:
-        # Read the input JSON file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            skins = json.load(f)
-        
-        total_skins = len(skins)
-        logger.info(f"Found {total_skins} skins to process")
-        
-        # Create/clear the output file with an empty array
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump([], f)
-        logger.info(f"Created/cleared output file: {output_file}")
-        
-        # Create rate-limited client
-        client = RateLimitedClient()
-        
-        try:
-            # Process each skin
-            processed_skins = []
-            for i, skin in enumerate(skins, 1):
+        # Open the input JSON file, skins are read from it lazily below
+        with open(input_file, 'rb') as input_f:
+            # Load the nameid lookup table
+            nameid_cache = load_nameid_cache()
+            logger.info(f"Loaded {len(nameid_cache)} cached nameids")
+            semaphore = asyncio.Semaphore(max_concurrency)
+            pending = set()
+            
+            # Processed skins are appended to a JSON-Lines file in input order. Finished skins
+            # wait in `ready` until all earlier ones are written
+            jsonl_file = os.path.splitext(output_file)[0] + '.jsonl'
+            ready = {}
+            next_index = 1
+            processed_count = 0
+            write_error = None
+            
+            def write_ready():
+                """Write finished skins that are next in input order"""
+                nonlocal next_index, processed_count
+                while next_index in ready:
+                    skin = ready.pop(next_index)
+                    next_index += 1
+                    if skin is not None:
+                        # Append the skin (including ones with error info) to the checkpoint file
+                        jsonl.write(orjson.dumps(skin, option=orjson.OPT_APPEND_NEWLINE))
+                        processed_count += 1
+                        if processed_count % JSONL_FLUSH_EVERY == 0:
+                            jsonl.flush()
+                        
+                        if processed_count % PROGRESS_LOG_EVERY == 0:
+                            logger.info("Progress: %d skins processed", processed_count)
+            
+            async def fetch(i: int, skin: dict):
+                """
+                Fetch market data for a single skin and hand it over to be written in input order
+                
+                The semaphore slot is released as soon as the fetch is done, so a slow skin
+                doesn't stop others from being fetched while it waits to be written.
+                """
+                nonlocal write_error
+                result = skin
                 try:
                     # Create hashname from skin name
                     if 'name' not in skin:
-                        logger.warning(f"Skipping skin {i}/{total_skins}: No name found")
-                        continue
-                    
-                    # Get market data
-                    skin_names = skin['name'].split(' | ')
-                    hashname = get_hashname(skin_names[0], skin_names[1], skin.get('wear', 0), skin.get('stat', 0))
-                    market_data = item_data(hashname, client)
-                    
-                    # Add market data to skin info
-                    skin['market_data'] = market_data
-                    logger.info(f"Processed skin {i}/{total_skins}: {skin['name']}")
-                    
-                    # Add to processed skins and update file
-                    processed_skins.append(skin)
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(processed_skins, f, indent=2)
-                    
-                    progress = (i/total_skins)*100
-                    logger.info(f"Progress: {i}/{total_skins} skins processed ({progress:.1f}%)")
+                        logger.warning("Skipping skin %d: No name found", i)
+                        result = None
+                    else:
+                        # Get market data
+                        skin_names = skin['name'].split(' | ')
+                        hashname = get_hashname(skin_names[0], skin_names[1], skin.get('wear', 0), skin.get('stat', 0))
+                        market_data = await item_data(hashname, client, nameid_cache, pool)
+                        
+                        # Add market data to skin info
+                        skin['market_data'] = market_data
+                        logger.debug("Processed skin %d: %s", i, skin['name'])
                     
                 except Exception as e:
-                    logger.error(f"Error processing skin {i}/{total_skins} ({skin.get('name', 'Unknown')}): {str(e)}")
+                    logger.error("Error processing skin %d (%s): %s", i, skin.get('name', 'Unknown'), e)
                     skin['market_data'] = {"error": str(e)}
-                    # Still save the skin with error info
-                    processed_skins.append(skin)
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(processed_skins, f, indent=2)
-                    continue
+                
+                finally:
+                    semaphore.release()
+                
+                # Once a write has failed, the checkpoint can't be continued in input order
+                if write_error is not None:
+                    return
+                ready[i] = result
+                try:
+                    write_ready()
+                except Exception as e:
+                    write_error = e
+            
+            with open(jsonl_file, 'wb') as jsonl:
+                try:
+                    # Process skins concurrently as they are read, parsing responses in worker processes
+                    # No more than max_concurrency responses can be waiting to be parsed at once
+                    with ProcessPoolExecutor(max_workers=min(max_concurrency, os.cpu_count() or 1)) as pool:
+                        try:
+                            for i, skin in enumerate(ijson.items(input_f, 'item', use_float=True), 1):
+                                await semaphore.acquire()
+                                if write_error is not None:
+                                    semaphore.release()
+                                    break
+                                task = asyncio.create_task(fetch(i, skin))
+                                pending.add(task)
+                                task.add_done_callback(pending.discard)
+                        finally:
+                            # Let the skins already scheduled finish
+                            await asyncio.gather(*pending)
+                    
+                    if write_error is not None:
+                        raise write_error
+                
+                finally:
+                    # Make sure we keep the nameids scraped so far
+                    save_nameid_cache(nameid_cache)
         
-        finally:
-            # Make sure we close the client
-            client.close()
+        # Convert the checkpoint file into the final JSON array in one pass
+        jsonl_to_json(jsonl_file, output_file)
+        os.remove(jsonl_file)
         
         elapsed_time = time.time() - start_time
-        logger.info(f"Processing complete! Time taken: {elapsed_time:.2f} seconds")
+        logger.info(f"Processing complete! {processed_count} skins processed in {elapsed_time:.2f} seconds")
         logger.info(f"All data saved to {output_file}")
         
     except FileNotFoundError:
         logger.error(f"Could not find the input file {input_file}")
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         logger.error(f"{input_file} is not a valid JSON file")
     except Exception as e:
         logger.error(f"An unexpected error occurred: {str(e)}")
 
+async def main():
+    """Collect market data for all skins over a single shared client"""
+    async with RateLimitedClient() as client:
+        await process_all_skins(client)
+
 if __name__ == '__main__':
     logger.info("Starting market data collection")
-    process_all_skins()
+    asyncio.run(main())
@@ -1,6 +1,20 @@
-import json
+import ijson
+import orjson
 import os
 
+# Rarity mapping based on rarity ID
+RARITY_MAPPING = {
+    'rarity_ancient_weapon': 0,     # covert
+    'rarity_legendary_weapon': 1,   # classified
+    'rarity_mythical_weapon': 2,    # restricted
+    'rarity_rare_weapon': 3,        # mil-spec
+    'rarity_uncommon_weapon': 4,    # industrial grade
+    'rarity_common_weapon': 5       # consumer grade
+}
+
+# Fields to remove
+FIELDS_TO_REMOVE = ('description', 'category', 'team', 'legacy_model')
+
 def sanitize_skin_data(input_file: str = 'skin_info.json', output_file: str = 'skin_info_sanitized.json'):
     """
     Read the skin info JSON file, remove specified fields, and add wear/rarity integers.
@@ -19,55 +33,49 @@ def sanitize_skin_data(input_file: str = 'skin_info.json', output_file: str = 's
         input_file: Path to the input JSON file
         output_file: Path where the sanitized JSON will be saved
     """
-    # Rarity mapping based on rarity ID
-    rarity_mapping = {
-        'rarity_ancient_weapon': 0,     # covert
-        'rarity_legendary_weapon': 1,   # classified
-        'rarity_mythical_weapon': 2,    # restricted
-        'rarity_rare_weapon': 3,        # mil-spec
-        'rarity_uncommon_weapon': 4,    # industrial grade
-        'rarity_common_weapon': 5       # consumer grade
-    }
-    
+    # Write to a temporary file first, so the existing output (or the input itself, if
+    # it's the same file) is only replaced once sanitizing has fully succeeded
+    tmp_file = output_file + '.tmp'
     try:
-        # Read the input JSON file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Fields to remove
-        fields_to_remove = ['description', 'category', 'team', 'legacy_model']
-        
-        # Process each item
-        for item in data:
-            # Remove specified fields
-            for field in fields_to_remove:
-                if field in item:
-                    del item[field]
-            
-            # Add wear integer to each wear in the wears array
-            if 'wears' in item and isinstance(item['wears'], list):
-                for i, wear in enumerate(item['wears']):
-                    if isinstance(wear, dict):
+        # Stream items from the input JSON file and write each one out as soon as it's sanitized
+        with open(input_file, 'rb') as src, open(tmp_file, 'wb') as dst:
+            dst.write(b'[')
+            count = 0
+            for item in ijson.items(src, 'item', use_float=True):
+                # Remove specified fields
+                for field in FIELDS_TO_REMOVE:
+                    item.pop(field, None)
+                
+                # Add wear integer to each wear in the wears array
+                wears = item.get('wears')
+                if wears:
+                    for i, wear in enumerate(wears):
                         wear['int'] = i
-            
-            # Add rarity integer based on mapping
-            if 'rarity' in item and isinstance(item['rarity'], dict) and 'id' in item['rarity']:
-                rarity_id = item['rarity']['id']
-                item['rarity']['int'] = rarity_mapping.get(rarity_id)
-        
-        # Save the sanitized data
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+                
+                # Add rarity integer based on mapping
+                rarity = item.get('rarity')
+                if rarity and 'id' in rarity:
+                    rarity['int'] = RARITY_MAPPING.get(rarity['id'])
+                
+                # Save the sanitized item, indented one level inside the array
+                dst.write(b',\n  ' if count else b'\n  ')
+                dst.write(orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+                count += 1
+            dst.write(b'\n]' if count else b']')
+        os.replace(tmp_file, output_file)
         
         print(f"Successfully sanitized {input_file}")
         print(f"Saved sanitized data to {output_file}")
         
     except FileNotFoundError:
         print(f"Error: Could not find the input file {input_file}")
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         print(f"Error: {input_file} is not a valid JSON file")
     except Exception as e:
         print(f"Error: An unexpected error occurred: {str(e)}")
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
 if __name__ == '__main__':
     sanitize_skin_data()
\ No newline at end of file